@@ -2,16 +2,20 @@ from __future__ import annotations
 
 import cgi
 import json
-from datetime import datetime
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse
 
-from energie_backtest.costs import calculate_quarter_costs
-from energie_backtest.dynamic_tariffs import build_tariffs_for_consumption, peak_share
-from energie_backtest.models import ConsumptionRecord
-from energie_backtest.reporting import CostReport, build_cost_report
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+from energie_backtest.backtest import run_dynamic_backtest
+from energie_backtest.reporting import CostReport
 from upload_flow import UploadValidationError, parse_fluvius_upload
 
 APP_ROOT = Path(__file__).resolve().parent
@@ -56,9 +60,8 @@ class BacktestHandler(BaseHTTPRequestHandler):
             self._send_json({"error": "Referentieprijs is ongeldig."}, status=400)
             return
 
-        file_bytes = file_item.file.read()
         try:
-            parsed_upload = parse_fluvius_upload(file_bytes, file_item.filename)
+            parsed_upload = parse_fluvius_upload(file_item.file, file_item.filename)
         except UploadValidationError as exc:
             self._send_json(
                 {"error": "Upload validatie mislukt.", "details": exc.user_messages()},
@@ -66,24 +69,23 @@ class BacktestHandler(BaseHTTPRequestHandler):
             )
             return
 
-        consumption = [
-            ConsumptionRecord(
-                timestamp=_parse_timestamp(item["timestamp_utc"]),
-                consumption_kwh=float(item["value"]),
-            )
-            for item in parsed_upload.series
-        ]
-
-        tariffs = build_tariffs_for_consumption(consumption)
-        costs = calculate_quarter_costs(
-            consumption,
-            tariffs,
-            fallback_tariff_eur_per_kwh=reference_price,
+        timestamps = (
+            np.asarray(parsed_upload.utc_epoch_us, dtype=np.int64)
+            .astype("datetime64[us]")
+            .astype("datetime64[ns]")
+        )
+        consumption_kwh = np.asarray(parsed_upload.values, dtype=np.float64)
+        # Monthly totals stay on UTC months, as the upload report always used.
+        result = run_dynamic_backtest(
+            timestamps,
+            consumption_kwh,
+            reference_price,
+            period="month",
+            period_timezone=None,
         )
-        report = build_cost_report(costs, reference_price, period="month")
 
-        monthly = _format_monthly(report.aggregated_costs, report.aggregated_reference_costs)
-        summary = _build_summary(report, monthly, consumption)
+        monthly = _format_monthly(result.report)
+        summary = _build_summary(result.report, monthly, result.peak_share)
 
         self._send_json({"summary": summary, "monthly": monthly})
 
@@ -100,7 +102,10 @@ class BacktestHandler(BaseHTTPRequestHandler):
         self.wfile.write(payload)
 
     def _send_json(self, payload: dict[str, Any], *, status: int = 200) -> None:
-        data = json.dumps(payload).encode("utf-8")
+        if orjson is not None:
+            data = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            data = json.dumps(payload).encode("utf-8")
         self.send_response(status)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("Content-Length", str(len(data)))
@@ -108,24 +113,17 @@ class BacktestHandler(BaseHTTPRequestHandler):
         self.wfile.write(data)
 
 
-def _parse_timestamp(raw: str | float) -> datetime:
-    if isinstance(raw, datetime):
-        return raw
-    return datetime.fromisoformat(str(raw))
-
-
-def _format_monthly(
-    costs: dict[tuple[int, int], float],
-    reference: dict[tuple[int, int], float],
-) -> list[dict[str, object]]:
+def _format_monthly(report: CostReport) -> list[dict[str, object]]:
+    costs = np.round(report.period_costs, 2).tolist()
+    reference = np.round(report.period_reference_costs, 2).tolist()
     formatted = []
-    for (year, month), value in sorted(costs.items()):
-        reference_value = reference.get((year, month), 0.0)
+    for index in range(len(costs)):
+        year, month = report.period_keys[index]
         formatted.append(
             {
                 "period": f"{year}-{month:02d}",
-                "cost_eur": round(value, 2),
-                "reference_cost_eur": round(reference_value, 2),
+                "cost_eur": costs[index],
+                "reference_cost_eur": reference[index],
             }
         )
     return formatted
@@ -134,7 +132,7 @@ def _format_monthly(
 def _build_summary(
     report: CostReport,
     monthly: list[dict[str, object]],
-    consumption: list[ConsumptionRecord],
+    peak_share: float,
 ) -> dict[str, object]:
     months_count = max(1, len(monthly))
     average_monthly = report.total_cost_eur / months_count
@@ -144,7 +142,7 @@ def _build_summary(
         "difference_eur": round(report.difference_eur, 2),
         "difference_pct": round(report.difference_pct, 1),
         "average_monthly_cost_eur": round(average_monthly, 2),
-        "peak_share_pct": round(peak_share(consumption) * 100.0, 1),
+        "peak_share_pct": round(peak_share * 100.0, 1),
     }
 
 
@@ -1,19 +1,38 @@
-"""Energy backtest modules for tariff ingestion, cost calculation, aggregation, and reporting."""
-
-from .aggregates import aggregate_costs
-from .costs import calculate_quarter_costs
-from .models import ConsumptionRecord, QuarterCost, Tariff, TariffSeries
-from .reporting import build_cost_report
-from .tariffs import read_tariffs_from_csv, read_tariffs_from_rows
-
-__all__ = [
-    "aggregate_costs",
-    "build_cost_report",
-    "calculate_quarter_costs",
-    "ConsumptionRecord",
-    "QuarterCost",
-    "read_tariffs_from_csv",
-    "read_tariffs_from_rows",
-    "Tariff",
-    "TariffSeries",
-]
+"""Energy backtest modules for tariff ingestion, cost calculation, aggregation, and reporting.
+
+The public names are imported on first access, so NumPy-free submodules such
+as `energie_backtest.zones` can be imported without NumPy installed.
+"""
+
+from importlib import import_module
+
+_EXPORTS = {
+    "aggregate_costs": ".aggregates",
+    "BacktestResult": ".backtest",
+    "build_cost_report": ".reporting",
+    "calculate_quarter_costs": ".costs",
+    "ConsumptionRecord": ".models",
+    "ConsumptionSeries": ".models",
+    "QuarterCost": ".models",
+    "QuarterCosts": ".models",
+    "read_tariffs_from_csv": ".tariffs",
+    "read_tariffs_from_rows": ".tariffs",
+    "run_dynamic_backtest": ".backtest",
+    "Tariff": ".models",
+    "TariffSeries": ".models",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> object:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None
+
+
+def _quarter_cost_loop(
+    kwh: np.ndarray, prices: np.ndarray, fallback_mask: np.ndarray, fallback: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    tariff = np.empty_like(prices)
+    totals = np.empty_like(kwh)
+    for i in range(kwh.shape[0]):
+        price = fallback if fallback_mask[i] else prices[i]
+        tariff[i] = price
+        totals[i] = kwh[i] * price
+    return tariff, totals
+
+
+def _peak_stats_loop(kwh: np.ndarray, peak_mask: np.ndarray) -> Tuple[float, float]:
+    peak = 0.0
+    total = 0.0
+    for i in range(kwh.shape[0]):
+        if peak_mask[i]:
+            peak += kwh[i]
+        total += kwh[i]
+    return peak, total
+
+
+def _quarter_cost_numpy(
+    kwh: np.ndarray, prices: np.ndarray, fallback_mask: np.ndarray, fallback: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    tariff = np.where(fallback_mask, fallback, prices)
+    return tariff, kwh * tariff
+
+
+def _peak_stats_numpy(kwh: np.ndarray, peak_mask: np.ndarray) -> Tuple[float, float]:
+    return float(kwh[peak_mask].sum()), float(kwh.sum())
+
+
+if njit is not None:
+    quarter_cost_kernel = njit(cache=True, fastmath=True)(_quarter_cost_loop)
+    peak_stats_kernel = njit(cache=True, fastmath=True)(_peak_stats_loop)
+else:  # pragma: no cover - depends on optional dependency
+    quarter_cost_kernel = _quarter_cost_numpy
+    peak_stats_kernel = _peak_stats_numpy
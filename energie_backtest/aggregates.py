@@ -1,32 +1,90 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from datetime import datetime
-from typing import Dict, Iterable, Tuple
+from datetime import tzinfo as dt_tzinfo
+from typing import Dict, Iterable, List, Tuple
 
-from .models import QuarterCost
+import numpy as np
+
+from .models import QuarterCost, QuarterCosts
+from .timestamps import to_wall_clock
 
 PeriodKey = Tuple[int, int, int] | Tuple[int, int] | Tuple[int]
 
+_PERIOD_UNITS = {"day": "D", "month": "M", "year": "Y"}
+
 
 def aggregate_costs(
-    costs: Iterable[QuarterCost],
+    costs: Iterable[QuarterCost] | QuarterCosts | None = None,
     period: str = "day",
+    *,
+    timestamps: np.ndarray | None = None,
+    values: np.ndarray | None = None,
+    buckets: Tuple[List[PeriodKey], np.ndarray] | None = None,
+    timezone: str | dt_tzinfo | None = None,
 ) -> Dict[PeriodKey, float]:
-    """Aggregate costs by day, month, or year."""
+    """Aggregate costs by day, month, or year.
 
-    totals: Dict[PeriodKey, float] = defaultdict(float)
-    for item in costs:
-        key = _period_key(item.timestamp, period)
-        totals[key] += item.total_cost_eur
-    return dict(totals)
+    Cost objects are bucketed in the timezone of their timestamps unless
+    ``timezone`` overrides it. Instead of cost objects, parallel
+    ``timestamps`` (UTC ``datetime64``) and ``values`` arrays can be passed to
+    aggregate any per-quarter amount. ``buckets`` reuses a `period_index`
+    result for the same timestamps, so several amounts can be aggregated
+    without recomputing the period keys.
+    """
 
+    if costs is not None:
+        if not isinstance(costs, QuarterCosts):
+            costs = QuarterCosts.from_costs(costs)
+        timestamps, values = costs.timestamps, costs.total_cost_eur
+        if timezone is None:
+            timezone = costs.tzinfo
+    elif timestamps is None or values is None:
+        raise ValueError("provide either costs or both timestamps and values")
+    if buckets is None:
+        buckets = period_index(timestamps, period, timezone=timezone)
+    keys, index = buckets
+    totals = np.zeros(len(keys))
+    np.add.at(totals, index, values)
+    return dict(zip(keys, totals.tolist()))
 
-def _period_key(timestamp: datetime, period: str) -> PeriodKey:
-    if period == "day":
-        return (timestamp.year, timestamp.month, timestamp.day)
-    if period == "month":
-        return (timestamp.year, timestamp.month)
+
+def period_index(
+    timestamps: np.ndarray,
+    period: str = "day",
+    *,
+    timezone: str | dt_tzinfo | None = None,
+) -> Tuple[List[PeriodKey], np.ndarray]:
+    """Map UTC ``datetime64`` timestamps to sorted period keys and a bucket index.
+
+    Periods are days, months or years of the local calendar of ``timezone``
+    (a zone name or tzinfo); without one they follow the UTC calendar.
+
+    Periods are numbered by their offset from the first one (for months
+    ``(year - first_year) * 12 + month - first_month``), so no sort or hash is
+    needed; empty periods are dropped from the buckets.
+    """
+
+    unit = _PERIOD_UNITS.get(period)
+    if unit is None:
+        raise ValueError("period must be 'day', 'month', or 'year'")
+    timestamps = to_wall_clock(timestamps, timezone)
+    codes = timestamps.astype(f"datetime64[{unit}]").astype(np.int64)
+    if codes.size == 0:
+        return [], codes
+    first = codes.min()
+    offsets = codes - first
+    occupied = np.bincount(offsets) > 0
+    bucket_of_offset = np.cumsum(occupied) - 1
+    periods = (np.flatnonzero(occupied) + first).astype(f"datetime64[{unit}]")
+    return _period_keys(periods, period), bucket_of_offset[offsets]
+
+
+def _period_keys(periods: np.ndarray, period: str) -> List[PeriodKey]:
+    years = periods.astype("datetime64[Y]").astype(np.int64) + 1970
     if period == "year":
-        return (timestamp.year,)
-    raise ValueError("period must be 'day', 'month', or 'year'")
+        return [(year,) for year in years.tolist()]
+    months = periods.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    if period == "month":
+        return list(zip(years.tolist(), months.tolist()))
+    days = (periods - periods.astype("datetime64[M]")).astype(np.int64) + 1
+    return list(zip(years.tolist(), months.tolist(), days.tolist()))
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .dynamic_tariffs import (
+    DEFAULT_OFFPEAK_EUR_PER_KWH,
+    DEFAULT_PEAK_END_HOUR,
+    DEFAULT_PEAK_EUR_PER_KWH,
+    DEFAULT_PEAK_START_HOUR,
+    DEFAULT_SURCHARGE_EUR_PER_KWH,
+    DEFAULT_TIMEZONE,
+    peak_hours_mask,
+    peak_offpeak_prices,
+)
+from .reporting import CostReport, build_all_metrics, report_from_metrics
+
+
+@dataclass(frozen=True)
+class BacktestResult:
+    """Per-quarter columns of the backtest, plus the report and peak share."""
+
+    timestamps: np.ndarray
+    consumption_kwh: np.ndarray
+    price_eur_per_kwh: np.ndarray
+    cost_eur: np.ndarray
+    peak: np.ndarray
+    report: CostReport
+    peak_share: float
+
+
+def run_dynamic_backtest(
+    timestamps: np.ndarray,
+    consumption_kwh: np.ndarray,
+    reference_price_eur_per_kwh: float,
+    *,
+    timezone: str = DEFAULT_TIMEZONE,
+    base_offpeak_eur_per_kwh: float = DEFAULT_OFFPEAK_EUR_PER_KWH,
+    base_peak_eur_per_kwh: float = DEFAULT_PEAK_EUR_PER_KWH,
+    surcharge_eur_per_kwh: float = DEFAULT_SURCHARGE_EUR_PER_KWH,
+    peak_start_hour: int = DEFAULT_PEAK_START_HOUR,
+    peak_end_hour: int = DEFAULT_PEAK_END_HOUR,
+    period: str = "month",
+    period_timezone: str | None = None,
+) -> BacktestResult:
+    """Run the peak/off-peak tariff backtest on contiguous per-quarter columns.
+
+    The peak flag, price and cost are each one contiguous array, computed in
+    that order, and the report is built from those columns. ``timezone`` only
+    decides peak hours; report periods follow the calendar of
+    ``period_timezone``, which defaults to UTC.
+    """
+
+    timestamps = np.asarray(timestamps, dtype="datetime64[ns]")
+    consumption_kwh = np.asarray(consumption_kwh, dtype=np.float64)
+    peak = peak_hours_mask(
+        timestamps,
+        timezone=timezone,
+        peak_start_hour=peak_start_hour,
+        peak_end_hour=peak_end_hour,
+    )
+    prices = peak_offpeak_prices(
+        peak,
+        base_offpeak_eur_per_kwh=base_offpeak_eur_per_kwh,
+        base_peak_eur_per_kwh=base_peak_eur_per_kwh,
+        surcharge_eur_per_kwh=surcharge_eur_per_kwh,
+    )
+    costs = consumption_kwh * prices
+
+    metrics = build_all_metrics(
+        timestamps,
+        consumption_kwh,
+        prices,
+        reference_price_eur_per_kwh,
+        peak,
+        period=period,
+        costs=costs,
+        timezone=period_timezone,
+    )
+    peak_share = (
+        metrics.peak_consumption_kwh / metrics.consumption_kwh
+        if metrics.consumption_kwh
+        else 0.0
+    )
+    return BacktestResult(
+        timestamps=timestamps,
+        consumption_kwh=consumption_kwh,
+        price_eur_per_kwh=prices,
+        cost_eur=costs,
+        peak=peak,
+        report=report_from_metrics(metrics),
+        peak_share=peak_share,
+    )
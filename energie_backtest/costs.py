@@ -1,40 +1,48 @@
 from __future__ import annotations
 
-from typing import Iterable, List, Sequence
+from typing import Iterable, Sequence
 
-from .models import ConsumptionRecord, QuarterCost, TariffSeries
+from ._kernels import quarter_cost_kernel
+from .models import (
+    ConsumptionRecord,
+    ConsumptionSeries,
+    QuarterCost,
+    QuarterCosts,
+    TariffSeries,
+    as_consumption_series,
+)
+from .timestamps import to_datetimes
 
 
 def calculate_quarter_costs(
-    consumption: Sequence[ConsumptionRecord],
+    consumption: Sequence[ConsumptionRecord] | ConsumptionSeries,
     tariffs: TariffSeries,
     *,
     fallback_tariff_eur_per_kwh: float | None = None,
-) -> List[QuarterCost]:
+) -> QuarterCosts:
     """Calculate quarter-hour costs by matching consumption with tariffs."""
 
-    results: List[QuarterCost] = []
-    for record in consumption:
-        tariff = tariffs.get(record.timestamp)
-        if tariff is None:
-            if fallback_tariff_eur_per_kwh is None:
-                raise ValueError(
-                    f"Missing tariff for {record.timestamp.isoformat()} and no fallback provided."
-                )
-            tariff_price = fallback_tariff_eur_per_kwh
-        else:
-            tariff_price = tariff.total_price_eur_per_kwh
-        total_cost = record.consumption_kwh * tariff_price
-        results.append(
-            QuarterCost(
-                timestamp=record.timestamp,
-                consumption_kwh=record.consumption_kwh,
-                tariff_eur_per_kwh=tariff_price,
-                total_cost_eur=total_cost,
-            )
+    series = as_consumption_series(consumption)
+    tariff_prices, found = tariffs.lookup(series.timestamps)
+    missing = ~found
+    if fallback_tariff_eur_per_kwh is None and missing.any():
+        first_missing = to_datetimes(series.timestamps[missing][:1], series.tzinfo)[0]
+        raise ValueError(
+            f"Missing tariff for {first_missing.isoformat()} and no fallback provided."
         )
-    return results
+    tariff_prices, totals = quarter_cost_kernel(
+        series.consumption_kwh, tariff_prices, missing, fallback_tariff_eur_per_kwh or 0.0
+    )
+    return QuarterCosts(
+        timestamps=series.timestamps,
+        consumption_kwh=series.consumption_kwh,
+        tariff_eur_per_kwh=tariff_prices,
+        total_cost_eur=totals,
+        tzinfo=series.tzinfo,
+    )
 
 
-def total_cost(costs: Iterable[QuarterCost]) -> float:
+def total_cost(costs: Iterable[QuarterCost] | QuarterCosts) -> float:
+    if isinstance(costs, QuarterCosts):
+        return float(costs.total_cost_eur.sum())
     return sum(item.total_cost_eur for item in costs)
@@ -1,59 +1,128 @@
 from __future__ import annotations
 
-from datetime import datetime
 from typing import Iterable
-from zoneinfo import ZoneInfo
 
-from .models import ConsumptionRecord, Tariff, TariffSeries
+import numpy as np
+
+from ._kernels import peak_stats_kernel
+from .models import (
+    ConsumptionRecord,
+    ConsumptionSeries,
+    TariffSeries,
+    as_consumption_series,
+)
+from .timestamps import local_offsets
+
+DEFAULT_TIMEZONE = "Europe/Brussels"
+DEFAULT_OFFPEAK_EUR_PER_KWH = 0.18
+DEFAULT_PEAK_EUR_PER_KWH = 0.28
+DEFAULT_SURCHARGE_EUR_PER_KWH = 0.02
+DEFAULT_PEAK_START_HOUR = 7
+DEFAULT_PEAK_END_HOUR = 22
 
 
 def build_tariffs_for_consumption(
-    consumption: Iterable[ConsumptionRecord],
+    consumption: Iterable[ConsumptionRecord] | ConsumptionSeries,
     *,
-    timezone: str = "Europe/Brussels",
-    base_offpeak_eur_per_kwh: float = 0.18,
-    base_peak_eur_per_kwh: float = 0.28,
-    surcharge_eur_per_kwh: float = 0.02,
-    peak_start_hour: int = 7,
-    peak_end_hour: int = 22,
+    timezone: str = DEFAULT_TIMEZONE,
+    base_offpeak_eur_per_kwh: float = DEFAULT_OFFPEAK_EUR_PER_KWH,
+    base_peak_eur_per_kwh: float = DEFAULT_PEAK_EUR_PER_KWH,
+    surcharge_eur_per_kwh: float = DEFAULT_SURCHARGE_EUR_PER_KWH,
+    peak_start_hour: int = DEFAULT_PEAK_START_HOUR,
+    peak_end_hour: int = DEFAULT_PEAK_END_HOUR,
 ) -> TariffSeries:
-    tzinfo = ZoneInfo(timezone)
-    tariffs = []
-    for record in consumption:
-        local_dt = record.timestamp.astimezone(tzinfo)
-        if _is_peak(local_dt, peak_start_hour, peak_end_hour):
-            base_price = base_peak_eur_per_kwh
-        else:
-            base_price = base_offpeak_eur_per_kwh
-        tariffs.append(
-            Tariff(
-                timestamp=record.timestamp,
-                base_price_eur_per_kwh=base_price,
-                surcharge_eur_per_kwh=surcharge_eur_per_kwh,
-            )
-        )
-    return TariffSeries.from_tariffs(tariffs)
+    series = as_consumption_series(consumption)
+    peak_mask = peak_hours_mask(
+        series.timestamps,
+        timezone=timezone,
+        peak_start_hour=peak_start_hour,
+        peak_end_hour=peak_end_hour,
+    )
+    prices = peak_offpeak_prices(
+        peak_mask,
+        base_offpeak_eur_per_kwh=base_offpeak_eur_per_kwh,
+        base_peak_eur_per_kwh=base_peak_eur_per_kwh,
+        surcharge_eur_per_kwh=surcharge_eur_per_kwh,
+    )
+    return TariffSeries.from_arrays(series.timestamps, prices)
+
+
+def peak_offpeak_prices(
+    peak_mask: np.ndarray,
+    *,
+    base_offpeak_eur_per_kwh: float = DEFAULT_OFFPEAK_EUR_PER_KWH,
+    base_peak_eur_per_kwh: float = DEFAULT_PEAK_EUR_PER_KWH,
+    surcharge_eur_per_kwh: float = DEFAULT_SURCHARGE_EUR_PER_KWH,
+) -> np.ndarray:
+    """Total price per quarter-hour (base price plus surcharge) from a peak mask."""
+
+    prices = np.where(peak_mask, base_peak_eur_per_kwh, base_offpeak_eur_per_kwh)
+    prices += surcharge_eur_per_kwh
+    return prices
 
 
 def peak_share(
-    consumption: Iterable[ConsumptionRecord],
+    consumption: Iterable[ConsumptionRecord] | ConsumptionSeries,
+    *,
+    timezone: str = DEFAULT_TIMEZONE,
+    peak_start_hour: int = DEFAULT_PEAK_START_HOUR,
+    peak_end_hour: int = DEFAULT_PEAK_END_HOUR,
+) -> float:
+    series = as_consumption_series(consumption)
+    return peak_share_arrays(
+        series.timestamps,
+        series.consumption_kwh,
+        timezone=timezone,
+        peak_start_hour=peak_start_hour,
+        peak_end_hour=peak_end_hour,
+    )
+
+
+def peak_share_arrays(
+    timestamps: np.ndarray,
+    consumption_kwh: np.ndarray,
     *,
-    timezone: str = "Europe/Brussels",
-    peak_start_hour: int = 7,
-    peak_end_hour: int = 22,
+    timezone: str = DEFAULT_TIMEZONE,
+    peak_start_hour: int = DEFAULT_PEAK_START_HOUR,
+    peak_end_hour: int = DEFAULT_PEAK_END_HOUR,
 ) -> float:
-    tzinfo = ZoneInfo(timezone)
-    peak_total = 0.0
-    overall = 0.0
-    for record in consumption:
-        local_dt = record.timestamp.astimezone(tzinfo)
-        if _is_peak(local_dt, peak_start_hour, peak_end_hour):
-            peak_total += record.consumption_kwh
-        overall += record.consumption_kwh
+    """Share of consumption in peak hours, from UTC ``datetime64`` and kWh arrays."""
+
+    peak_mask = peak_hours_mask(
+        timestamps,
+        timezone=timezone,
+        peak_start_hour=peak_start_hour,
+        peak_end_hour=peak_end_hour,
+    )
+    peak_total, overall = peak_stats_kernel(consumption_kwh, peak_mask)
     if overall == 0:
         return 0.0
     return peak_total / overall
 
 
-def _is_peak(local_dt: datetime, peak_start_hour: int, peak_end_hour: int) -> bool:
-    return peak_start_hour <= local_dt.hour < peak_end_hour
+def peak_hours_mask(
+    timestamps: np.ndarray,
+    *,
+    timezone: str = DEFAULT_TIMEZONE,
+    peak_start_hour: int = DEFAULT_PEAK_START_HOUR,
+    peak_end_hour: int = DEFAULT_PEAK_END_HOUR,
+) -> np.ndarray:
+    """Flag UTC ``datetime64`` timestamps that fall in local peak hours."""
+
+    hours = _local_hours(timestamps, timezone)
+    return _peak_table(peak_start_hour, peak_end_hour)[hours]
+
+
+def _peak_table(peak_start_hour: int, peak_end_hour: int) -> np.ndarray:
+    """Peak flag per local hour of day, indexed by hour."""
+
+    hours_of_day = np.arange(24)
+    return (hours_of_day >= peak_start_hour) & (hours_of_day < peak_end_hour)
+
+
+def _local_hours(timestamps: np.ndarray, timezone: str) -> np.ndarray:
+    """Local hour of day for UTC ``datetime64`` timestamps."""
+
+    seconds = timestamps.astype("datetime64[s]").astype(np.int64)
+    local = seconds + local_offsets(seconds, timezone)
+    return ((local // 3600) % 24).astype(np.int8)
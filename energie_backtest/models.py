@@ -1,24 +1,32 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Dict, Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timezone, tzinfo as dt_tzinfo
+from typing import Iterable, Iterator, Mapping, Sequence, Tuple
 
+import numpy as np
 
-@dataclass(frozen=True)
+from .timestamps import common_tzinfo, parse_utc_iso, to_datetime64, to_datetimes
+
+
+@dataclass(frozen=True, slots=True)
 class Tariff:
     """Tariff per quarter-hour, including base market price and surcharge."""
 
     timestamp: datetime
     base_price_eur_per_kwh: float
     surcharge_eur_per_kwh: float = 0.0
+    total_price_eur_per_kwh: float = field(init=False, compare=False)
 
-    @property
-    def total_price_eur_per_kwh(self) -> float:
-        return self.base_price_eur_per_kwh + self.surcharge_eur_per_kwh
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "total_price_eur_per_kwh",
+            self.base_price_eur_per_kwh + self.surcharge_eur_per_kwh,
+        )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ConsumptionRecord:
     """Consumption per quarter-hour."""
 
@@ -27,6 +35,42 @@ class ConsumptionRecord:
 
 
 @dataclass(frozen=True)
+class ConsumptionSeries:
+    """Consumption per quarter-hour as parallel UTC ``datetime64[ns]`` and kWh arrays.
+
+    ``tzinfo`` is the timezone the timestamps were given in (``None`` for
+    naive ones). Iterating converts back to it, and cost periods are bucketed
+    in it by default.
+    """
+
+    timestamps: np.ndarray
+    consumption_kwh: np.ndarray
+    tzinfo: dt_tzinfo | None = timezone.utc
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __iter__(self) -> Iterator[ConsumptionRecord]:
+        for timestamp, consumption_kwh in zip(
+            to_datetimes(self.timestamps, self.tzinfo), self.consumption_kwh.tolist()
+        ):
+            yield ConsumptionRecord(timestamp=timestamp, consumption_kwh=consumption_kwh)
+
+    @classmethod
+    def from_records(cls, records: Iterable[ConsumptionRecord]) -> "ConsumptionSeries":
+        records = list(records)
+        return cls(
+            timestamps=to_datetime64(record.timestamp for record in records),
+            consumption_kwh=np.fromiter(
+                (record.consumption_kwh for record in records),
+                dtype=np.float64,
+                count=len(records),
+            ),
+            tzinfo=common_tzinfo(record.timestamp for record in records),
+        )
+
+
+@dataclass(frozen=True, slots=True)
 class QuarterCost:
     """Computed cost for a quarter-hour period."""
 
@@ -36,18 +80,127 @@ class QuarterCost:
     total_cost_eur: float
 
 
+@dataclass(frozen=True)
+class QuarterCosts:
+    """Quarter-hour costs as parallel arrays; indexing and iterating yield `QuarterCost` objects.
+
+    Timestamps are UTC ``datetime64[ns]``; ``tzinfo`` works as on
+    `ConsumptionSeries`.
+    """
+
+    timestamps: np.ndarray
+    consumption_kwh: np.ndarray
+    tariff_eur_per_kwh: np.ndarray
+    total_cost_eur: np.ndarray
+    tzinfo: dt_tzinfo | None = timezone.utc
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, index: int | slice) -> "QuarterCost | QuarterCosts":
+        if isinstance(index, slice):
+            return QuarterCosts(
+                timestamps=self.timestamps[index],
+                consumption_kwh=self.consumption_kwh[index],
+                tariff_eur_per_kwh=self.tariff_eur_per_kwh[index],
+                total_cost_eur=self.total_cost_eur[index],
+                tzinfo=self.tzinfo,
+            )
+        return QuarterCost(
+            timestamp=to_datetimes(self.timestamps[[index]], self.tzinfo)[0],
+            consumption_kwh=float(self.consumption_kwh[index]),
+            tariff_eur_per_kwh=float(self.tariff_eur_per_kwh[index]),
+            total_cost_eur=float(self.total_cost_eur[index]),
+        )
+
+    def __iter__(self) -> Iterator[QuarterCost]:
+        for timestamp, consumption_kwh, tariff, total in zip(
+            to_datetimes(self.timestamps, self.tzinfo),
+            self.consumption_kwh.tolist(),
+            self.tariff_eur_per_kwh.tolist(),
+            self.total_cost_eur.tolist(),
+        ):
+            yield QuarterCost(
+                timestamp=timestamp,
+                consumption_kwh=consumption_kwh,
+                tariff_eur_per_kwh=tariff,
+                total_cost_eur=total,
+            )
+
+    @classmethod
+    def from_costs(cls, costs: Iterable[QuarterCost]) -> "QuarterCosts":
+        costs = list(costs)
+        count = len(costs)
+        return cls(
+            timestamps=to_datetime64(item.timestamp for item in costs),
+            consumption_kwh=np.fromiter(
+                (item.consumption_kwh for item in costs), dtype=np.float64, count=count
+            ),
+            tariff_eur_per_kwh=np.fromiter(
+                (item.tariff_eur_per_kwh for item in costs), dtype=np.float64, count=count
+            ),
+            total_cost_eur=np.fromiter(
+                (item.total_cost_eur for item in costs), dtype=np.float64, count=count
+            ),
+            tzinfo=common_tzinfo(item.timestamp for item in costs),
+        )
+
+
 @dataclass(frozen=True)
 class TariffSeries:
-    """Lookup table for tariffs keyed by quarter-hour timestamp."""
+    """Total price per quarter-hour as sorted UTC timestamp and EUR/kWh arrays."""
+
+    timestamps: np.ndarray
+    prices: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def get(self, timestamp: datetime) -> float | None:
+        prices, found = self.lookup(to_datetime64([timestamp]))
+        return float(prices[0]) if found[0] else None
 
-    tariffs: Dict[datetime, Tariff]
+    def lookup(self, timestamps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Align total prices with UTC ``datetime64[ns]`` timestamps.
 
-    def get(self, timestamp: datetime) -> Tariff | None:
-        return self.tariffs.get(timestamp)
+        Returns the prices and a mask of the timestamps that have a tariff;
+        unmatched timestamps get a NaN price.
+        """
+
+        if self.timestamps.size == 0:
+            return np.full(len(timestamps), np.nan), np.zeros(len(timestamps), dtype=bool)
+        positions = np.searchsorted(self.timestamps, timestamps)
+        positions = np.minimum(positions, self.timestamps.size - 1)
+        found = self.timestamps[positions] == timestamps
+        prices = np.where(found, self.prices[positions], np.nan)
+        return prices, found
+
+    @classmethod
+    def from_arrays(cls, timestamps: np.ndarray, prices: np.ndarray) -> "TariffSeries":
+        """Sort the arrays by timestamp; for duplicate timestamps the last price wins."""
+
+        timestamps = np.asarray(timestamps, dtype="datetime64[ns]")
+        prices = np.asarray(prices, dtype=np.float64)
+        order = np.argsort(timestamps, kind="stable")
+        timestamps = timestamps[order]
+        prices = prices[order]
+        if timestamps.size > 1:
+            last = np.append(timestamps[1:] != timestamps[:-1], True)
+            timestamps = timestamps[last]
+            prices = prices[last]
+        return cls(timestamps=timestamps, prices=prices)
 
     @classmethod
     def from_tariffs(cls, tariffs: Iterable[Tariff]) -> "TariffSeries":
-        return cls({tariff.timestamp: tariff for tariff in tariffs})
+        tariffs = list(tariffs)
+        return cls.from_arrays(
+            to_datetime64(tariff.timestamp for tariff in tariffs),
+            np.fromiter(
+                (tariff.total_price_eur_per_kwh for tariff in tariffs),
+                dtype=np.float64,
+                count=len(tariffs),
+            ),
+        )
 
     @classmethod
     def from_rows(
@@ -57,21 +210,41 @@ class TariffSeries:
         base_price_key: str = "base_price_eur_per_kwh",
         surcharge_key: str = "surcharge_eur_per_kwh",
     ) -> "TariffSeries":
-        parsed: Dict[datetime, Tariff] = {}
+        timestamps = []
+        base_prices = []
+        surcharges = []
         for row in rows:
-            timestamp_value = row[timestamp_key]
-            timestamp = _ensure_datetime(timestamp_value)
-            base_price = float(row[base_price_key])
-            surcharge = float(row.get(surcharge_key, 0.0))
-            parsed[timestamp] = Tariff(
-                timestamp=timestamp,
-                base_price_eur_per_kwh=base_price,
-                surcharge_eur_per_kwh=surcharge,
-            )
-        return cls(parsed)
+            timestamps.append(row[timestamp_key])
+            base_prices.append(row[base_price_key])
+            surcharges.append(row.get(surcharge_key, 0.0))
+        # float() per cell, so a missing cell (None from a short CSV row)
+        # raises instead of becoming a NaN price.
+        count = len(timestamps)
+        prices = np.fromiter(
+            (float(value) for value in base_prices), dtype=np.float64, count=count
+        ) + np.fromiter(
+            (float(value) for value in surcharges), dtype=np.float64, count=count
+        )
+        return cls.from_arrays(_timestamps_to_datetime64(timestamps), prices)
+
+
+def as_consumption_series(
+    consumption: Sequence[ConsumptionRecord] | ConsumptionSeries,
+) -> ConsumptionSeries:
+    if isinstance(consumption, ConsumptionSeries):
+        return consumption
+    return ConsumptionSeries.from_records(consumption)
+
+
+def _timestamps_to_datetime64(values: Sequence[object]) -> np.ndarray:
+    if all(type(value) is str for value in values):
+        return parse_utc_iso(values)
+    return to_datetime64(_ensure_datetime(value) for value in values)
 
 
 def _ensure_datetime(value: object) -> datetime:
+    if type(value) is str:
+        return datetime.fromisoformat(value)
     if isinstance(value, datetime):
         return value
     if isinstance(value, str):
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable
+from datetime import tzinfo as dt_tzinfo
+from typing import Dict, Iterable, List
 
-from .aggregates import PeriodKey, aggregate_costs
-from .costs import total_cost
-from .models import QuarterCost
+import numpy as np
+
+from .aggregates import PeriodKey, period_index
+from .models import QuarterCost, QuarterCosts
 
 
 @dataclass(frozen=True)
@@ -14,64 +16,120 @@ class CostReport:
     reference_cost_eur: float
     difference_eur: float
     difference_pct: float
-    aggregated_costs: Dict[PeriodKey, float]
-    aggregated_reference_costs: Dict[PeriodKey, float]
+    period_keys: List[PeriodKey]
+    period_costs: np.ndarray
+    period_reference_costs: np.ndarray
+
+    @property
+    def aggregated_costs(self) -> Dict[PeriodKey, float]:
+        return dict(zip(self.period_keys, self.period_costs.tolist()))
+
+    @property
+    def aggregated_reference_costs(self) -> Dict[PeriodKey, float]:
+        return dict(zip(self.period_keys, self.period_reference_costs.tolist()))
+
+
+@dataclass(frozen=True)
+class CostMetrics:
+    total_cost_eur: float
+    reference_cost_eur: float
+    peak_cost_eur: float
+    consumption_kwh: float
+    peak_consumption_kwh: float
+    period_keys: List[PeriodKey]
+    period_costs: np.ndarray
+    period_reference_costs: np.ndarray
 
 
 def build_cost_report(
-    costs: Iterable[QuarterCost],
+    costs: Iterable[QuarterCost] | QuarterCosts,
     reference_price_eur_per_kwh: float,
     *,
     period: str = "month",
+    timezone: str | dt_tzinfo | None = None,
 ) -> CostReport:
-    """Compare total cost to a reference price and aggregate by period."""
+    """Compare total cost to a reference price and aggregate by period.
 
-    costs_list = list(costs)
-    total = total_cost(costs_list)
-    reference_total = _reference_total(costs_list, reference_price_eur_per_kwh)
-    difference = total - reference_total
-    difference_pct = _difference_pct(reference_total, difference)
+    Periods are taken in the costs' own timezone unless ``timezone`` is given.
+    """
 
-    aggregated_costs = aggregate_costs(costs_list, period=period)
-    aggregated_reference_costs = _aggregate_reference_costs(
-        costs_list, reference_price_eur_per_kwh, period
+    if not isinstance(costs, QuarterCosts):
+        costs = QuarterCosts.from_costs(costs)
+    if timezone is None:
+        timezone = costs.tzinfo
+    metrics = build_all_metrics(
+        costs.timestamps,
+        costs.consumption_kwh,
+        costs.tariff_eur_per_kwh,
+        reference_price_eur_per_kwh,
+        period=period,
+        timezone=timezone,
     )
+    return report_from_metrics(metrics)
+
+
+def report_from_metrics(metrics: CostMetrics) -> CostReport:
+    total = metrics.total_cost_eur
+    reference_total = metrics.reference_cost_eur
+    difference = total - reference_total
+    difference_pct = _difference_pct(reference_total, difference)
 
     return CostReport(
         total_cost_eur=total,
         reference_cost_eur=reference_total,
         difference_eur=difference,
         difference_pct=difference_pct,
-        aggregated_costs=aggregated_costs,
-        aggregated_reference_costs=aggregated_reference_costs,
+        period_keys=metrics.period_keys,
+        period_costs=metrics.period_costs,
+        period_reference_costs=metrics.period_reference_costs,
     )
 
 
-def _reference_total(
-    costs: Iterable[QuarterCost], reference_price_eur_per_kwh: float
-) -> float:
-    return sum(item.consumption_kwh * reference_price_eur_per_kwh for item in costs)
+def build_all_metrics(
+    timestamps: np.ndarray,
+    consumption_kwh: np.ndarray,
+    prices: np.ndarray,
+    reference_price_eur_per_kwh: float,
+    peak_mask: np.ndarray | None = None,
+    *,
+    period: str = "month",
+    costs: np.ndarray | None = None,
+    timezone: str | dt_tzinfo | None = None,
+) -> CostMetrics:
+    """Compute totals, peak figures and per-period sums in a single pass over the arrays.
+
+    ``costs`` may pass an already computed ``consumption_kwh * prices`` array,
+    and ``timezone`` is handed to `period_index`.
+    """
+
+    if costs is None:
+        costs = consumption_kwh * prices
+    keys, index = period_index(timestamps, period, timezone=timezone)
+    period_costs = np.zeros(len(keys))
+    period_consumption = np.zeros(len(keys))
+    np.add.at(period_costs, index, costs)
+    np.add.at(period_consumption, index, consumption_kwh)
+
+    if peak_mask is None:
+        peak_cost = peak_consumption = 0.0
+    else:
+        peak_cost = float(costs[peak_mask].sum())
+        peak_consumption = float(consumption_kwh[peak_mask].sum())
+
+    consumption_total = float(consumption_kwh.sum())
+    return CostMetrics(
+        total_cost_eur=float(costs.sum()),
+        reference_cost_eur=consumption_total * reference_price_eur_per_kwh,
+        peak_cost_eur=peak_cost,
+        consumption_kwh=consumption_total,
+        peak_consumption_kwh=peak_consumption,
+        period_keys=keys,
+        period_costs=period_costs,
+        period_reference_costs=period_consumption * reference_price_eur_per_kwh,
+    )
 
 
 def _difference_pct(reference_total: float, difference: float) -> float:
     if reference_total == 0:
         return 0.0
     return (difference / reference_total) * 100.0
-
-
-def _aggregate_reference_costs(
-    costs: Iterable[QuarterCost],
-    reference_price_eur_per_kwh: float,
-    period: str,
-) -> Dict[PeriodKey, float]:
-    reference_costs = []
-    for item in costs:
-        reference_costs.append(
-            QuarterCost(
-                timestamp=item.timestamp,
-                consumption_kwh=item.consumption_kwh,
-                tariff_eur_per_kwh=reference_price_eur_per_kwh,
-                total_cost_eur=item.consumption_kwh * reference_price_eur_per_kwh,
-            )
-        )
-    return aggregate_costs(reference_costs, period=period)
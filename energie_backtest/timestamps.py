@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import warnings
+from datetime import datetime, timedelta, timezone, tzinfo as dt_tzinfo
+from typing import Dict, Iterable, List, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from .zones import offset_changes, utc_offset, zone
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_UTC_SUFFIX = "+00:00"
+_DAY_SECONDS = 86_400
+# Offsets are tabulated from 1970-01-01 up to 2100-01-01 (UTC epoch seconds),
+# and ten more years past any timestamp outside that span.
+_TRANSITIONS_START = 0
+_TRANSITIONS_END = 4_102_444_800
+_TRANSITIONS_MARGIN = 3_650 * _DAY_SECONDS
+_TRANSITION_TABLES: Dict[str, Tuple[int, int, np.ndarray, np.ndarray]] = {}
+
+
+def to_datetime64(timestamps: Iterable[datetime]) -> np.ndarray:
+    """Convert datetimes to a UTC ``datetime64[ns]`` array; naive values are read as UTC."""
+
+    micros = np.fromiter((_epoch_micros(value) for value in timestamps), dtype=np.int64)
+    return micros.astype("datetime64[us]").astype("datetime64[ns]")
+
+
+def parse_utc_iso(values: Sequence[str]) -> np.ndarray:
+    """Parse ISO 8601 strings into a UTC ``datetime64[ns]`` array.
+
+    Strings without an offset (read as UTC) or with a ``+00:00``/``Z`` suffix
+    are parsed by NumPy's C parser in one call; other offsets go through
+    `datetime.fromisoformat`.
+    """
+
+    raw = np.asarray(values, dtype=str)
+    if raw.size:
+        utc = np.char.endswith(raw, _UTC_SUFFIX) | np.char.endswith(raw, "Z")
+        naive = (np.char.find(raw, "+") < 0) & (np.char.rfind(raw, "-") < 10)
+        if (utc | naive).all():
+            stripped = np.char.replace(np.char.replace(raw, _UTC_SUFFIX, ""), "Z", "")
+            if _iso_shaped(stripped).all():
+                # NumPy is more lenient than fromisoformat and only warns on
+                # some input, so any warning falls back to fromisoformat.
+                with warnings.catch_warnings():
+                    warnings.simplefilter("error")
+                    try:
+                        return stripped.astype("datetime64[ns]")
+                    except (ValueError, Warning):
+                        pass
+    return to_datetime64(datetime.fromisoformat(value) for value in raw.tolist())
+
+
+def _iso_shaped(values: np.ndarray) -> np.ndarray:
+    """Flag strings that start with ``YYYY-MM-DD`` and have no surrounding whitespace."""
+
+    width = max(values.dtype.itemsize // 4, 11)
+    chars = values.astype(f"<U{width}").view("<U1").reshape(len(values), width)
+    lengths = np.char.str_len(values)
+    last = chars[np.arange(len(values)), np.maximum(lengths - 1, 0)]
+    return (
+        (lengths >= 10)
+        & (chars[:, 4] == "-")
+        & (chars[:, 7] == "-")
+        & ((lengths == 10) | (chars[:, 10] == "T") | (chars[:, 10] == " "))
+        & ~np.char.isspace(chars[:, 0])
+        & ~np.char.isspace(last)
+    )
+
+
+def to_datetimes(
+    timestamps: np.ndarray, tzinfo: dt_tzinfo | None = timezone.utc
+) -> List[datetime]:
+    """Convert a UTC ``datetime64`` array back to datetimes in ``tzinfo``.
+
+    With ``tzinfo=None`` the datetimes are naive UTC, the reverse of how
+    `to_datetime64` reads naive values.
+    """
+
+    naive = timestamps.astype("datetime64[us]").astype(object)
+    if tzinfo is None:
+        return list(naive)
+    utc = [value.replace(tzinfo=timezone.utc) for value in naive]
+    if tzinfo is timezone.utc:
+        return utc
+    return [value.astimezone(tzinfo) for value in utc]
+
+
+def common_tzinfo(timestamps: Iterable[datetime]) -> dt_tzinfo | None:
+    """The tzinfo shared by all timestamps; ``None`` if all are naive, UTC if they differ."""
+
+    tzinfos = {value.tzinfo for value in timestamps}
+    if len(tzinfos) == 1:
+        return tzinfos.pop()
+    return timezone.utc
+
+
+def to_wall_clock(
+    timestamps: np.ndarray, timezone: str | dt_tzinfo | None
+) -> np.ndarray:
+    """Local wall-clock ``datetime64[ns]`` values of UTC ``datetime64`` timestamps."""
+
+    timestamps = np.asarray(timestamps, dtype="datetime64[ns]")
+    if timezone is None:
+        return timestamps
+    seconds = timestamps.astype("datetime64[s]").astype(np.int64)
+    return timestamps + local_offsets(seconds, timezone).astype("timedelta64[s]")
+
+
+def local_offsets(epoch_seconds: np.ndarray, timezone: str | dt_tzinfo) -> np.ndarray:
+    """UTC offset in seconds of ``timezone`` (a zone name or tzinfo) at each UTC epoch second."""
+
+    if epoch_seconds.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    if isinstance(timezone, ZoneInfo) and timezone.key:
+        timezone = timezone.key
+    if not isinstance(timezone, str):
+        fixed = timezone.utcoffset(None)
+        if fixed is not None:
+            return np.full(epoch_seconds.shape, int(fixed.total_seconds()), dtype=np.int64)
+        return np.fromiter(
+            (utc_offset(timezone, seconds) for seconds in epoch_seconds.tolist()),
+            dtype=np.int64,
+            count=epoch_seconds.size,
+        )
+    transitions, offsets = zone_transitions(
+        timezone, int(epoch_seconds.min()), int(epoch_seconds.max())
+    )
+    return offsets[np.searchsorted(transitions, epoch_seconds, side="right")]
+
+
+def _epoch_micros(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def zone_transitions(
+    name: str, first: int = _TRANSITIONS_START, last: int = _TRANSITIONS_END
+) -> Tuple[np.ndarray, np.ndarray]:
+    """UTC offset changes of a timezone in UTC epoch seconds, cached per zone.
+
+    Returns the epoch seconds at which a new offset starts and the offsets in
+    effect before the first and after each transition. The table covers
+    1970-2100 and is rebuilt over a wider span when ``first``/``last`` fall
+    outside the cached one.
+    """
+
+    cached = _TRANSITION_TABLES.get(name)
+    if cached is not None and cached[0] <= first and last <= cached[1]:
+        return cached[2], cached[3]
+    start, end = _TRANSITIONS_START, _TRANSITIONS_END
+    if cached is not None:
+        start, end = cached[0], cached[1]
+    if first < start:
+        start = first - _TRANSITIONS_MARGIN
+    if last > end:
+        end = last + _TRANSITIONS_MARGIN
+    tzinfo = zone(name)
+    transitions, offsets = offset_changes(
+        lambda seconds: utc_offset(tzinfo, seconds), start, end
+    )
+    transition_array = np.array(transitions, dtype=np.int64)
+    offset_array = np.array(offsets, dtype=np.int64)
+    transition_array.setflags(write=False)
+    offset_array.setflags(write=False)
+    _TRANSITION_TABLES[name] = (start, end, transition_array, offset_array)
+    return transition_array, offset_array
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone, tzinfo as dt_tzinfo
+from functools import lru_cache
+from typing import Callable, List, Tuple
+from zoneinfo import ZoneInfo
+
+_WALL_EPOCH = datetime(1970, 1, 1)
+_DAY_SECONDS = 86_400
+
+
+@lru_cache(maxsize=16)
+def zone(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+
+def offset_changes(
+    offset_at: Callable[[int], int], start: int, end: int
+) -> Tuple[List[int], List[int]]:
+    """Find where ``offset_at`` changes between two times in whole seconds.
+
+    Steps a day at a time and bisects each day whose offset differs. Returns
+    the times at which a new offset starts and the offsets before the first
+    and after each change.
+    """
+
+    changes: List[int] = []
+    offsets = [offset_at(start)]
+    previous = start
+    while previous < end:
+        current = min(previous + _DAY_SECONDS, end)
+        offset = offset_at(current)
+        if offset != offsets[-1]:
+            low, high = previous, current
+            while high - low > 1:
+                middle = (low + high) // 2
+                if offset_at(middle) == offsets[-1]:
+                    low = middle
+                else:
+                    high = middle
+            changes.append(high)
+            offsets.append(offset)
+        previous = current
+    return changes, offsets
+
+
+def utc_offset(tzinfo: dt_tzinfo, epoch_seconds: int) -> int:
+    """UTC offset in seconds of ``tzinfo`` at a UTC epoch second."""
+
+    local = datetime.fromtimestamp(epoch_seconds, tz=timezone.utc).astimezone(tzinfo)
+    return int(local.utcoffset().total_seconds())
+
+
+def wall_offset(tzinfo: dt_tzinfo, wall_seconds: int) -> int:
+    """UTC offset in seconds of ``tzinfo`` at a wall-clock second, with ``fold=0``."""
+
+    local = (_WALL_EPOCH + timedelta(seconds=wall_seconds)).replace(tzinfo=tzinfo)
+    return int(local.utcoffset().total_seconds())
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from energie_backtest import (  # noqa: E402
+    ConsumptionRecord,
+    Tariff,
+    TariffSeries,
+    aggregate_costs,
+    build_cost_report,
+    calculate_quarter_costs,
+)
+
+BRUSSELS = ZoneInfo("Europe/Brussels")
+
+
+def _costs(start: datetime):
+    records = [
+        ConsumptionRecord(start + timedelta(minutes=15 * index), 1.0)
+        for index in range(24)
+    ]
+    tariffs = TariffSeries.from_tariffs(
+        Tariff(record.timestamp, 0.25) for record in records
+    )
+    return calculate_quarter_costs(records, tariffs)
+
+
+def test_periods_follow_the_records_timezone():
+    costs = _costs(datetime(2024, 1, 31, 20, tzinfo=BRUSSELS))
+
+    report = build_cost_report(costs, 0.3)
+
+    assert report.aggregated_costs == {(2024, 1): 4.0, (2024, 2): 2.0}
+    assert aggregate_costs(costs, "day") == {(2024, 1, 31): 4.0, (2024, 2, 1): 2.0}
+    assert costs[0].timestamp == datetime(2024, 1, 31, 20, tzinfo=BRUSSELS)
+    assert costs[0].timestamp.tzinfo is BRUSSELS
+
+
+def test_naive_records_stay_naive():
+    costs = _costs(datetime(2024, 1, 31, 20))
+
+    assert [item.timestamp for item in costs][:2] == [
+        datetime(2024, 1, 31, 20),
+        datetime(2024, 1, 31, 20, 15),
+    ]
+    assert build_cost_report(costs, 0.3).aggregated_costs == {
+        (2024, 1): 4.0,
+        (2024, 2): 2.0,
+    }
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import datetime as dt
+from zoneinfo import ZoneInfo
+
+import pytest
+
+import upload_flow
+
+BRUSSELS = ZoneInfo("Europe/Brussels")
+
+
+@pytest.fixture(autouse=True)
+def raw_upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_flow, "RAW_UPLOAD_DIR", tmp_path)
+
+
+def _offset_csv(start_utc: dt.datetime, end_utc: dt.datetime) -> bytes:
+    lines = ["timestamp;volume"]
+    current = start_utc
+    while current < end_utc:
+        lines.append(f"{current.astimezone(BRUSSELS).isoformat()};0,25")
+        current += dt.timedelta(minutes=15)
+    return "\n".join(lines).encode("utf-8")
+
+
+@pytest.mark.parametrize(
+    "start_utc",
+    [
+        dt.datetime(2024, 10, 26, 22, tzinfo=dt.timezone.utc),
+        dt.datetime(2024, 3, 30, 22, tzinfo=dt.timezone.utc),
+    ],
+)
+def test_offset_timestamps_are_continuous_across_dst(start_utc):
+    end_utc = start_utc + dt.timedelta(hours=8)
+    upload = _offset_csv(start_utc, end_utc)
+
+    parsed = upload_flow.parse_fluvius_upload(upload, "verbruik.csv")
+
+    assert len(parsed.values) == 32
+    assert parsed.series[0]["timestamp_utc"] == start_utc.isoformat()
+    assert parsed.series[-1]["timestamp_utc"] == (
+        end_utc - dt.timedelta(minutes=15)
+    ).isoformat()
+
+
+def test_offset_timestamps_report_missing_quarter_in_their_offset():
+    start_utc = dt.datetime(2024, 10, 26, 22, tzinfo=dt.timezone.utc)
+    lines = _offset_csv(start_utc, start_utc + dt.timedelta(hours=8)).split(b"\n")
+    del lines[10]
+
+    with pytest.raises(upload_flow.UploadValidationError) as excinfo:
+        upload_flow.parse_fluvius_upload(b"\n".join(lines), "verbruik.csv")
+
+    assert [error.code for error in excinfo.value.errors] == ["missing_interval"]
+    assert excinfo.value.errors[0].message == (
+        "Ontbrekend kwartier: 2024-10-27T02:15:00+02:00."
+    )
+
+
+@pytest.mark.parametrize(
+    "scan",
+    [
+        upload_flow._scan_intervals_python,
+        pytest.param(
+            upload_flow._scan_intervals_numpy,
+            marks=pytest.mark.skipif(upload_flow.np is None, reason="needs NumPy"),
+        ),
+        pytest.param(
+            upload_flow._scan_intervals_numba,
+            marks=pytest.mark.skipif(
+                upload_flow._scan_sorted_kernel is None, reason="needs Numba"
+            ),
+        ),
+    ],
+)
+def test_interval_scans_agree(scan):
+    quarter = upload_flow._INTERVAL_MICROS
+    start = upload_flow._wall_micros(dt.datetime(2024, 1, 1))
+    quarters = [0, 1, 2, 2, 3, 60, 61, 61, 61, 62]
+    stamps = [start + index * quarter for index in quarters]
+    stamps.append(start + 62 * quarter + 60_000_000)
+    unsorted = stamps[5:] + stamps[:5][::-1]
+
+    order, duplicates, misaligned, missing = scan(unsorted)
+
+    assert [unsorted[index] for index in order] == stamps
+    assert list(duplicates) == [2, 6]
+    assert misaligned == 10
+    assert list(missing) == [
+        start + index * quarter
+        for index in range(4, 4 + upload_flow.MAX_INTERVAL_ERRORS)
+    ]
@@ -1,15 +1,51 @@
 from __future__ import annotations
 
+import bisect
 import csv
 import datetime as dt
+import io
 import pathlib
 import re
+import shutil
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import BinaryIO, Iterator, Sequence
 from zoneinfo import ZoneInfo
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # pragma: no cover - optional dependency
+    CalamineWorkbook = None
+
+from energie_backtest.zones import offset_changes, wall_offset, zone
+
 RAW_UPLOAD_DIR = pathlib.Path("data/uploads/raw")
 INTERVAL_MINUTES = 15
+IO_BUFFER_SIZE = 1 << 20
+CHUNK_ROWS = 1 << 16
+MAX_INTERVAL_ERRORS = 50
+
+_INTERVAL_SECONDS = INTERVAL_MINUTES * 60
+_INTERVAL_MICROS = _INTERVAL_SECONDS * 1_000_000
+_WALL_EPOCH = dt.datetime(1970, 1, 1)
+_WALL_EPOCH_ORDINAL = _WALL_EPOCH.toordinal()
+_UTC = dt.timezone.utc
+_UTC_EPOCH = dt.datetime(1970, 1, 1, tzinfo=_UTC)
+_DAY_SECONDS = 24 * 60 * 60
+_MICROSECOND = dt.timedelta(microseconds=1)
+_DAY_FIRST_SEPARATORS = ("/", "-")
+_FLOAT_TRANS = str.maketrans({",": ".", " ": None})
 
 
 @dataclass(frozen=True)
@@ -36,90 +72,164 @@ class UploadValidationError(Exception):
         ]
 
 
+@dataclass
+class ParsedRows:
+    tzinfo: ZoneInfo
+    wall_micros: list[int] | np.ndarray
+    values: list[float] | np.ndarray
+    # Rows whose timestamp carried its own UTC offset instead of the upload zone.
+    explicit_tzinfo: dict[int, dt.tzinfo]
+    # With NumPy, every CHUNK_ROWS rows move from the lists into int64/float64
+    # arrays, so large uploads do not hold a Python int and float per row.
+    chunks: list[tuple[np.ndarray, np.ndarray]] = field(default_factory=list)
+    chunked_count: int = 0
+
+    def append(self, local_dt: dt.datetime, value: float) -> None:
+        if local_dt.tzinfo is not self.tzinfo:
+            index = self.chunked_count + len(self.values)
+            self.explicit_tzinfo[index] = local_dt.tzinfo
+        self.wall_micros.append(_wall_micros(local_dt))
+        self.values.append(value)
+        if len(self.values) == CHUNK_ROWS and np is not None:
+            self._pack_chunk()
+
+    def finish(self) -> None:
+        """Join the packed chunks and the remaining rows into flat arrays."""
+
+        if np is None:
+            return
+        self._pack_chunk()
+        self.wall_micros = np.concatenate([wall for wall, _ in self.chunks])
+        self.values = np.concatenate([values for _, values in self.chunks])
+        self.chunks = []
+
+    def local_time(self, index: int) -> dt.datetime:
+        """Rebuild the parsed timestamp of a row, e.g. for an error message."""
+
+        tzinfo = self.explicit_tzinfo.get(index, self.tzinfo)
+        return _wall_datetime(int(self.wall_micros[index]), tzinfo)
+
+    def _pack_chunk(self) -> None:
+        self.chunks.append(
+            (
+                np.array(self.wall_micros, dtype=np.int64),
+                np.array(self.values, dtype=np.float64),
+            )
+        )
+        self.chunked_count += len(self.values)
+        self.wall_micros = []
+        self.values = []
+
+
 @dataclass(frozen=True)
 class ParsedUpload:
     raw_path: pathlib.Path
     timezone: str
     interval_minutes: int
-    series: list[dict[str, str | float]]
+    utc_epoch_us: Sequence[int]
+    values: Sequence[float]
+
+    @cached_property
+    def series(self) -> list[dict[str, str | float]]:
+        """Rows with ISO 8601 UTC timestamps, formatted on first access."""
+
+        return [
+            {"timestamp_utc": timestamp, "value": float(value)}
+            for timestamp, value in zip(_format_utc(self.utc_epoch_us), self.values)
+        ]
 
 
-def store_raw_upload(file_bytes: bytes, original_filename: str) -> pathlib.Path:
+def store_raw_upload(upload: bytes | BinaryIO, original_filename: str) -> pathlib.Path:
     RAW_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
     safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", original_filename)
-    stamp = dt.datetime.now(dt.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    stamp = dt.datetime.now(_UTC).strftime("%Y%m%dT%H%M%SZ")
     filename = f"{stamp}_{uuid.uuid4().hex}_{safe_name}"
     raw_path = RAW_UPLOAD_DIR / filename
-    raw_path.write_bytes(file_bytes)
+    if isinstance(upload, bytes):
+        raw_path.write_bytes(upload)
+    else:
+        with raw_path.open("wb", buffering=IO_BUFFER_SIZE) as handle:
+            shutil.copyfileobj(upload, handle, IO_BUFFER_SIZE)
     return raw_path
 
 
 def parse_fluvius_upload(
-    file_bytes: bytes,
+    upload: bytes | BinaryIO,
     original_filename: str,
     timezone: str = "Europe/Brussels",
 ) -> ParsedUpload:
-    raw_path = store_raw_upload(file_bytes, original_filename)
-    tzinfo = ZoneInfo(timezone)
+    raw_path = store_raw_upload(upload, original_filename)
+    tzinfo = zone(timezone)
     errors: list[ParsingError] = []
 
-    if raw_path.suffix.lower() == ".csv":
-        rows = _parse_csv(raw_path, tzinfo, errors)
-    elif raw_path.suffix.lower() in {".xlsx", ".xlsm"}:
-        rows = _parse_xlsx(raw_path, tzinfo, errors)
-    else:
-        raise UploadValidationError(
-            [
-                ParsingError(
-                    code="unsupported_format",
-                    message="Enkel CSV of Excel (.xlsx) wordt ondersteund.",
-                )
-            ],
-            raw_path,
-        )
+    with _open_upload(upload, raw_path) as source:
+        if raw_path.suffix.lower() == ".csv":
+            rows = _parse_csv(source, tzinfo, errors)
+        elif raw_path.suffix.lower() in {".xlsx", ".xlsm"}:
+            rows = _parse_xlsx(source, tzinfo, errors)
+        else:
+            raise UploadValidationError(
+                [
+                    ParsingError(
+                        code="unsupported_format",
+                        message="Enkel CSV of Excel (.xlsx) wordt ondersteund.",
+                    )
+                ],
+                raw_path,
+            )
 
     if errors:
         raise UploadValidationError(errors, raw_path)
 
-    _validate_intervals(rows, errors)
+    rows.finish()
+    utc_epoch_us = _utc_epoch_micros(rows) if len(rows.values) else []
+    _validate_intervals(rows, utc_epoch_us, errors)
     if errors:
         raise UploadValidationError(errors, raw_path)
 
-    series = [
-        {"timestamp_utc": row["timestamp"], "value": row["value"]}
-        for row in rows
-    ]
     return ParsedUpload(
         raw_path=raw_path,
         timezone=timezone,
         interval_minutes=INTERVAL_MINUTES,
-        series=series,
+        utc_epoch_us=utc_epoch_us,
+        values=rows.values,
     )
 
 
+def _open_upload(upload: bytes | BinaryIO, raw_path: pathlib.Path) -> BinaryIO:
+    """Parse in-memory uploads in place; streamed uploads are read back from disk."""
+
+    if isinstance(upload, bytes):
+        return io.BytesIO(upload)
+    return raw_path.open("rb", buffering=IO_BUFFER_SIZE)
+
+
 def _parse_csv(
-    raw_path: pathlib.Path,
+    source: BinaryIO,
     tzinfo: ZoneInfo,
     errors: list[ParsingError],
-) -> list[dict[str, str | float]]:
-    with raw_path.open("r", encoding="utf-8-sig", newline="") as handle:
-        reader = csv.DictReader(handle)
-        if reader.fieldnames is None:
+) -> ParsedRows:
+    delimiter = _detect_delimiter(source)
+    with io.TextIOWrapper(source, encoding="utf-8-sig", newline="") as handle:
+        reader = csv.reader(handle, delimiter=delimiter)
+        header_row = next(reader, None)
+        if header_row is None:
             errors.append(
                 ParsingError(
                     code="missing_header",
                     message="CSV-bestand mist een headerregel.",
                 )
             )
-            return []
+            return _empty_rows(tzinfo)
 
-        header = [name.strip() for name in reader.fieldnames]
-        timestamp_key = _find_header(header, ["timestamp", "tijdstip"]) \
+        header = [name.strip() for name in header_row]
+        lower_map = {name.lower(): name for name in header}
+        timestamp_key = _find_header(lower_map, ["timestamp", "tijdstip"]) \
             or ""
-        date_key = _find_header(header, ["van (datum)", "datum"]) or ""
-        time_key = _find_header(header, ["van (tijdstip)", "tijd", "uur"]) or ""
+        date_key = _find_header(lower_map, ["van (datum)", "datum"]) or ""
+        time_key = _find_header(lower_map, ["van (tijdstip)", "tijd", "uur"]) or ""
         value_key = _find_header(
-            header,
+            lower_map,
             ["volume", "afname_kwh", "waarde", "value", "kwh", "verbruik", "afname"],
         ) or ""
 
@@ -132,11 +242,16 @@ def _parse_csv(
                     ),
                 )
             )
-            return []
-
-        rows: list[dict[str, str | float]] = []
-        for index, row in enumerate(reader, start=2):
-            raw_value = (row.get(value_key) or "").strip()
+            return _empty_rows(tzinfo)
+
+        value_index = header.index(value_key)
+        timestamp_index = header.index(timestamp_key) if timestamp_key else -1
+        date_index = header.index(date_key) if date_key else -1
+        time_index = header.index(time_key) if time_key else -1
+        rows = _empty_rows(tzinfo)
+        cell = _field
+        for index, row in enumerate((row for row in reader if row), start=2):
+            raw_value = cell(row, value_index)
             if not raw_value:
                 errors.append(
                     ParsingError(
@@ -149,31 +264,47 @@ def _parse_csv(
             value = _parse_float(raw_value, index, errors)
 
             if timestamp_key:
-                timestamp_raw = (row.get(timestamp_key) or "").strip()
+                timestamp_raw = cell(row, timestamp_index)
                 local_dt = _parse_timestamp(timestamp_raw, tzinfo, index, errors)
             else:
-                date_raw = (row.get(date_key) or "").strip()
-                time_raw = (row.get(time_key) or "").strip()
+                date_raw = cell(row, date_index)
+                time_raw = cell(row, time_index)
                 local_dt = _parse_date_time(date_raw, time_raw, tzinfo, index, errors)
 
             if local_dt is None or value is None:
                 continue
 
-            rows.append(
-                {
-                    "timestamp": local_dt.astimezone(dt.timezone.utc).isoformat(),
-                    "local": local_dt,
-                    "value": value,
-                }
-            )
+            rows.append(local_dt, value)
         return rows
 
 
+def _detect_delimiter(source: BinaryIO) -> str:
+    """Pick the delimiter from the header line, sniffed on the raw bytes."""
+
+    header_line = source.read(4096).split(b"\n", 1)[0]
+    source.seek(0)
+    return ";" if header_line.count(b";") > header_line.count(b",") else ","
+
+
+def _field(row: list[str], index: int) -> str:
+    if index < 0 or index >= len(row):
+        return ""
+    return row[index].strip()
+
+
 def _parse_xlsx(
-    raw_path: pathlib.Path,
+    source: BinaryIO,
     tzinfo: ZoneInfo,
     errors: list[ParsingError],
-) -> list[dict[str, str | float]]:
+) -> ParsedRows:
+    if CalamineWorkbook is not None:
+        calamine_workbook = CalamineWorkbook.from_filelike(source)
+        try:
+            sheet_rows = iter(calamine_workbook.get_sheet_by_index(0).iter_rows())
+            return _parse_sheet_rows(sheet_rows, tzinfo, errors)
+        finally:
+            calamine_workbook.close()
+
     try:
         import openpyxl  # type: ignore
     except ImportError:  # pragma: no cover - optional dependency
@@ -183,26 +314,38 @@ def _parse_xlsx(
                 message="Excel parsing vereist openpyxl.",
             )
         )
-        return []
+        return _empty_rows(tzinfo)
+
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        sheet_rows = workbook.worksheets[0].iter_rows(values_only=True)
+        return _parse_sheet_rows(sheet_rows, tzinfo, errors)
+    finally:
+        workbook.close()
+
 
-    workbook = openpyxl.load_workbook(raw_path, read_only=True, data_only=True)
-    sheet = workbook.active
-    rows = list(sheet.iter_rows(values_only=True))
-    if not rows:
+def _parse_sheet_rows(
+    sheet_rows: Iterator[Sequence[object]],
+    tzinfo: ZoneInfo,
+    errors: list[ParsingError],
+) -> ParsedRows:
+    header_row = next(sheet_rows, None)
+    if header_row is None:
         errors.append(
             ParsingError(
                 code="empty_file",
                 message="Excel-bestand bevat geen data.",
             )
         )
-        return []
+        return _empty_rows(tzinfo)
 
-    header = [str(cell).strip() if cell is not None else "" for cell in rows[0]]
-    timestamp_key = _find_header(header, ["timestamp", "tijdstip"]) or ""
-    date_key = _find_header(header, ["van (datum)", "datum"]) or ""
-    time_key = _find_header(header, ["van (tijdstip)", "tijd", "uur"]) or ""
+    header = [str(cell).strip() if cell is not None else "" for cell in header_row]
+    lower_map = {name.lower(): name for name in header}
+    timestamp_key = _find_header(lower_map, ["timestamp", "tijdstip"]) or ""
+    date_key = _find_header(lower_map, ["van (datum)", "datum"]) or ""
+    time_key = _find_header(lower_map, ["van (tijdstip)", "tijd", "uur"]) or ""
     value_key = _find_header(
-        header,
+        lower_map,
         ["volume", "afname_kwh", "waarde", "value", "kwh", "verbruik", "afname"],
     ) or ""
 
@@ -213,12 +356,16 @@ def _parse_xlsx(
                 message="Verwacht kolommen timestamp/waarde of datum/tijd/waarde.",
             )
         )
-        return []
-
-    key_index = {name: header.index(name) for name in header if name}
-    rows_out: list[dict[str, str | float]] = []
-    for idx, row in enumerate(rows[1:], start=2):
-        raw_value = _cell_to_str(row, key_index.get(value_key, -1))
+        return _empty_rows(tzinfo)
+
+    value_index = header.index(value_key)
+    timestamp_index = header.index(timestamp_key) if timestamp_key else -1
+    date_index = header.index(date_key) if date_key else -1
+    time_index = header.index(time_key) if time_key else -1
+    rows_out = _empty_rows(tzinfo)
+    cell_to_str = _cell_to_str
+    for idx, row in enumerate(sheet_rows, start=2):
+        raw_value = cell_to_str(row, value_index)
         if not raw_value:
             errors.append(
                 ParsingError(
@@ -230,26 +377,24 @@ def _parse_xlsx(
             continue
         value = _parse_float(raw_value, idx, errors)
         if timestamp_key:
-            timestamp_raw = _cell_to_str(row, key_index.get(timestamp_key, -1))
+            timestamp_raw = cell_to_str(row, timestamp_index)
             local_dt = _parse_timestamp(timestamp_raw, tzinfo, idx, errors)
         else:
-            date_raw = _cell_to_str(row, key_index.get(date_key, -1))
-            time_raw = _cell_to_str(row, key_index.get(time_key, -1))
+            date_raw = cell_to_str(row, date_index)
+            time_raw = cell_to_str(row, time_index)
             local_dt = _parse_date_time(date_raw, time_raw, tzinfo, idx, errors)
 
         if local_dt is None or value is None:
             continue
 
-        rows_out.append(
-            {
-                "timestamp": local_dt.astimezone(dt.timezone.utc).isoformat(),
-                "local": local_dt,
-                "value": value,
-            }
-        )
+        rows_out.append(local_dt, value)
     return rows_out
 
 
+def _empty_rows(tzinfo: ZoneInfo) -> ParsedRows:
+    return ParsedRows(tzinfo=tzinfo, wall_micros=[], values=[], explicit_tzinfo={})
+
+
 def _parse_timestamp(
     raw: str,
     tzinfo: ZoneInfo,
@@ -265,19 +410,24 @@ def _parse_timestamp(
             )
         )
         return None
-    try:
-        parsed = dt.datetime.fromisoformat(raw)
-    except ValueError:
+    if raw[1:2] in _DAY_FIRST_SEPARATORS or raw[2:3] in _DAY_FIRST_SEPARATORS:
+        # ISO 8601 starts with a four-digit year, so day-first dates skip the
+        # raising fromisoformat call.
         parsed = _parse_datetime_fallback(raw)
-        if parsed is None:
-            errors.append(
-                ParsingError(
-                    code="invalid_timestamp",
-                    message=f"Ongeldige timestamp: {raw}.",
-                    row=row,
-                )
+    else:
+        try:
+            parsed = dt.datetime.fromisoformat(raw)
+        except ValueError:
+            parsed = _parse_datetime_fallback(raw)
+    if parsed is None:
+        errors.append(
+            ParsingError(
+                code="invalid_timestamp",
+                message=f"Ongeldige timestamp: {raw}.",
+                row=row,
             )
-            return None
+        )
+        return None
     if parsed.tzinfo is None:
         parsed = parsed.replace(tzinfo=tzinfo)
     return parsed
@@ -314,24 +464,34 @@ def _parse_date_time(
 
 
 def _parse_datetime_fallback(raw: str) -> dt.datetime | None:
-    formats = [
-        "%Y-%m-%d %H:%M",
-        "%Y-%m-%d %H:%M:%S",
-        "%d/%m/%Y %H:%M",
-        "%d-%m-%Y %H:%M",
-        "%d/%m/%Y %H:%M:%S",
-        "%d-%m-%Y %H:%M:%S",
-    ]
-    for fmt in formats:
-        try:
-            return dt.datetime.strptime(raw, fmt)
-        except ValueError:
-            continue
+    fmt = _fallback_format(raw)
+    if fmt is None:
+        return None
+    try:
+        return dt.datetime.strptime(raw, fmt)
+    except ValueError:
+        return None
+
+
+def _fallback_format(raw: str) -> str | None:
+    """Pick the one strptime format that can match, based on the first separator."""
+
+    position = 0
+    while position < len(raw) and raw[position].isdigit():
+        position += 1
+    if position == len(raw):
+        return None
+    separator = raw[position]
+    time_format = "%H:%M:%S" if raw.count(":") == 2 else "%H:%M"
+    if position == 4 and separator == "-":
+        return f"%Y-%m-%d {time_format}"
+    if position in (1, 2) and separator in "/-":
+        return f"%d{separator}%m{separator}%Y {time_format}"
     return None
 
 
 def _parse_float(raw: str, row: int, errors: list[ParsingError]) -> float | None:
-    cleaned = raw.replace(" ", "").replace(",", ".")
+    cleaned = raw.translate(_FLOAT_TRANS)
     try:
         return float(cleaned)
     except ValueError:
@@ -345,15 +505,15 @@ def _parse_float(raw: str, row: int, errors: list[ParsingError]) -> float | None
         return None
 
 
-def _find_header(header: list[str], candidates: list[str]) -> str | None:
-    lowered = {name.lower(): name for name in header}
+def _find_header(lower_map: dict[str, str], candidates: list[str]) -> str | None:
     for candidate in candidates:
-        if candidate.lower() in lowered:
-            return lowered[candidate.lower()]
+        match = lower_map.get(candidate.lower())
+        if match is not None:
+            return match
     return None
 
 
-def _cell_to_str(row: tuple[object, ...], index: int) -> str:
+def _cell_to_str(row: Sequence[object], index: int) -> str:
     if index < 0 or index >= len(row):
         return ""
     value = row[index]
@@ -367,10 +527,11 @@ def _cell_to_str(row: tuple[object, ...], index: int) -> str:
 
 
 def _validate_intervals(
-    rows: list[dict[str, str | float]],
+    rows: ParsedRows,
+    utc_epoch_us: Sequence[int],
     errors: list[ParsingError],
 ) -> None:
-    if not rows:
+    if len(rows.values) == 0:
         errors.append(
             ParsingError(
                 code="empty_data",
@@ -379,47 +540,218 @@ def _validate_intervals(
         )
         return
 
-    local_times = [row["local"] for row in rows if isinstance(row["local"], dt.datetime)]
-    local_times.sort()
-    seen: dict[dt.datetime, int] = {}
-    for value in local_times:
-        seen[value] = seen.get(value, 0) + 1
-
-    duplicates = [timestamp for timestamp, count in seen.items() if count > 1]
-    for timestamp in duplicates:
-        errors.append(
+    # Timestamps without an offset are checked on the wall clock, so the grid
+    # follows local time like the timestamps themselves. Once a row carries
+    # its own UTC offset the file is checked on UTC instants instead, so an
+    # offset-qualified file stays continuous across a DST change.
+    stamps = utc_epoch_us if rows.explicit_tzinfo else rows.wall_micros
+    scan = _scan_intervals_python
+    if _scan_sorted_kernel is not None:
+        scan = _scan_intervals_numba
+    elif np is not None:
+        scan = _scan_intervals_numpy
+    order, duplicates, misaligned, missing = scan(stamps)
+
+    # Beyond MAX_INTERVAL_ERRORS the messages add nothing for the user.
+    err_append = errors.append
+    for position in duplicates[:MAX_INTERVAL_ERRORS]:
+        timestamp = rows.local_time(order[position])
+        err_append(
             ParsingError(
                 code="duplicate_interval",
                 message=f"Dubbel kwartier gevonden: {timestamp.isoformat()}.",
             )
         )
 
-    for timestamp in local_times:
-        if timestamp.minute % INTERVAL_MINUTES != 0 or timestamp.second != 0:
-            errors.append(
-                ParsingError(
-                    code="invalid_interval",
-                    message=(
-                        "Tijdstempel valt niet op een 15-minuten interval: "
-                        f"{timestamp.isoformat()}."
-                    ),
-                )
+    if misaligned >= 0 and len(errors) < MAX_INTERVAL_ERRORS:
+        timestamp = rows.local_time(order[misaligned])
+        err_append(
+            ParsingError(
+                code="invalid_interval",
+                message=(
+                    "Tijdstempel valt niet op een 15-minuten interval: "
+                    f"{timestamp.isoformat()}."
+                ),
             )
-            break
-
-    start = local_times[0]
-    end = local_times[-1]
-    expected = set()
-    current = start
-    while current <= end:
-        expected.add(current)
-        current = current + dt.timedelta(minutes=INTERVAL_MINUTES)
+        )
 
-    missing = expected.difference(seen.keys())
-    for timestamp in sorted(missing):
-        errors.append(
+    tzinfo = rows.explicit_tzinfo.get(order[0], rows.tzinfo)
+    for value in missing[: MAX_INTERVAL_ERRORS - len(errors)]:
+        if rows.explicit_tzinfo:
+            timestamp = (_UTC_EPOCH + dt.timedelta(microseconds=value)).astimezone(tzinfo)
+        else:
+            timestamp = _wall_datetime(value, tzinfo)
+        err_append(
             ParsingError(
                 code="missing_interval",
                 message=f"Ontbrekend kwartier: {timestamp.isoformat()}.",
             )
         )
+
+
+def _scan_intervals_numpy(
+    stamps: list[int],
+) -> tuple[list[int], list[int], int, list[int]]:
+    values = np.asarray(stamps, dtype=np.int64)
+    order = np.argsort(values, kind="stable")
+    values = values[order]
+    unique, first_index, counts = np.unique(values, return_index=True, return_counts=True)
+    misaligned = np.flatnonzero((values // 1_000_000) % _INTERVAL_SECONDS != 0)
+    # Expected quarters are values[0] + k * interval. Between two neighbouring
+    # values the grid indices from just after the first up to the second are
+    # missing; only the first MAX_INTERVAL_ERRORS of them are generated.
+    offsets = unique - values[0]
+    after = offsets // _INTERVAL_MICROS + 1
+    upto = -(-offsets // _INTERVAL_MICROS)
+    gap_sizes = upto[1:] - after[:-1]
+    missing: list[int] = []
+    for gap in np.flatnonzero(gap_sizes > 0).tolist():
+        count = min(int(gap_sizes[gap]), MAX_INTERVAL_ERRORS - len(missing))
+        ticks = values[0] + (after[gap] + np.arange(count)) * _INTERVAL_MICROS
+        missing.extend(ticks.tolist())
+        if len(missing) == MAX_INTERVAL_ERRORS:
+            break
+    return (
+        order.tolist(),
+        first_index[counts > 1].tolist(),
+        int(misaligned[0]) if misaligned.size else -1,
+        missing,
+    )
+
+
+def _scan_intervals_numba(
+    stamps: list[int],
+) -> tuple[list[int], list[int], int, list[int]]:
+    values = np.asarray(stamps, dtype=np.int64)
+    order = np.argsort(values, kind="stable")
+    duplicates, misaligned, missing = _scan_sorted_kernel(values[order])
+    return order.tolist(), duplicates.tolist(), int(misaligned), missing.tolist()
+
+
+def _scan_sorted_loop(values):
+    """Duplicates, alignment and missing quarters in one pass over sorted values."""
+
+    count = values.shape[0]
+    duplicates = np.empty(count, dtype=np.int64)
+    missing = np.empty(MAX_INTERVAL_ERRORS, dtype=np.int64)
+    duplicate_count = 0
+    missing_count = 0
+    misaligned = -1
+    expected = values[0]
+    for position in range(count):
+        value = values[position]
+        if position > 0 and value == values[position - 1]:
+            if position < 2 or values[position - 2] != value:
+                duplicates[duplicate_count] = position - 1
+                duplicate_count += 1
+            continue
+        if misaligned < 0 and (value // 1_000_000) % _INTERVAL_SECONDS != 0:
+            misaligned = position
+        while expected < value and missing_count < MAX_INTERVAL_ERRORS:
+            missing[missing_count] = expected
+            missing_count += 1
+            expected += _INTERVAL_MICROS
+        if expected < value:
+            expected += -((expected - value) // _INTERVAL_MICROS) * _INTERVAL_MICROS
+        if expected == value:
+            expected += _INTERVAL_MICROS
+    return duplicates[:duplicate_count], misaligned, missing[:missing_count]
+
+
+if njit is not None and np is not None:
+    _scan_sorted_kernel = njit(cache=True)(_scan_sorted_loop)
+else:  # pragma: no cover - depends on optional dependency
+    _scan_sorted_kernel = None
+
+
+def _scan_intervals_python(
+    stamps: list[int],
+) -> tuple[list[int], list[int], int, list[int]]:
+    """Two-pointer walk of the sorted values against the expected quarter grid."""
+
+    order = sorted(range(len(stamps)), key=stamps.__getitem__)
+    values = [stamps[index] for index in order]
+    duplicates: list[int] = []
+    misaligned = -1
+    missing: list[int] = []
+    expected = values[0]
+    for position, value in enumerate(values):
+        if position and value == values[position - 1]:
+            if position < 2 or values[position - 2] != value:
+                duplicates.append(position - 1)
+            continue
+        if misaligned < 0 and (value // 1_000_000) % _INTERVAL_SECONDS:
+            misaligned = position
+        # Only the first MAX_INTERVAL_ERRORS gaps are reported; jump past the rest.
+        while expected < value and len(missing) < MAX_INTERVAL_ERRORS:
+            missing.append(expected)
+            expected += _INTERVAL_MICROS
+        if expected < value:
+            expected += -((expected - value) // _INTERVAL_MICROS) * _INTERVAL_MICROS
+        if expected == value:
+            expected += _INTERVAL_MICROS
+    return order, duplicates, misaligned, missing
+
+
+def _wall_micros(value: dt.datetime) -> int:
+    # Straight from the fields: replace() plus a timedelta division costs about
+    # four times as much per row.
+    seconds = value.hour * 3600 + value.minute * 60 + value.second
+    return (
+        (value.toordinal() - _WALL_EPOCH_ORDINAL) * _DAY_SECONDS + seconds
+    ) * 1_000_000 + value.microsecond
+
+
+def _wall_datetime(wall_micros: int, tzinfo: dt.tzinfo) -> dt.datetime:
+    return (_WALL_EPOCH + dt.timedelta(microseconds=wall_micros)).replace(tzinfo=tzinfo)
+
+
+def _utc_epoch_micros(rows: ParsedRows) -> Sequence[int]:
+    """UTC epoch microseconds of the rows, looking up zone offsets in bulk."""
+
+    wall = rows.wall_micros
+    if np is None:
+        bounds, offsets = _wall_offsets(rows.tzinfo, min(wall), max(wall))
+        utc = [value - offsets[bisect.bisect_right(bounds, value)] for value in wall]
+    else:
+        bounds, offsets = _wall_offsets(rows.tzinfo, int(wall.min()), int(wall.max()))
+        positions = np.searchsorted(np.array(bounds, dtype=np.int64), wall, "right")
+        utc = wall - np.array(offsets, dtype=np.int64)[positions]
+    # Timestamps with an explicit offset keep it instead of the upload zone's.
+    for index in rows.explicit_tzinfo:
+        utc[index] = wall[index] - rows.local_time(index).utcoffset() // _MICROSECOND
+    return utc
+
+
+def _wall_offsets(tzinfo: ZoneInfo, start: int, end: int) -> tuple[list[int], list[int]]:
+    """UTC offsets in microseconds of ``tzinfo`` between two wall-clock times.
+
+    Returns the wall-clock times at which the offset changes and the offsets
+    before the first and after each change. Wall-clock times in a DST gap or
+    overlap keep the earlier offset, as ``fold=0`` does.
+    """
+
+    bounds, offsets = offset_changes(
+        lambda seconds: wall_offset(tzinfo, seconds),
+        start // 1_000_000,
+        -(-end // 1_000_000),
+    )
+    return [bound * 1_000_000 for bound in bounds], [
+        offset * 1_000_000 for offset in offsets
+    ]
+
+
+def _format_utc(utc_epoch_us: Sequence[int]) -> list[str]:
+    if np is None:
+        return [
+            (_UTC_EPOCH + dt.timedelta(microseconds=value)).isoformat()
+            for value in utc_epoch_us
+        ]
+    stamps = np.asarray(utc_epoch_us, dtype=np.int64)
+    whole = stamps % 1_000_000 == 0
+    text = np.datetime_as_string(stamps.astype("datetime64[us]"), unit="s")
+    if not whole.all():
+        # isoformat only writes the fraction when there is one.
+        fraction = np.datetime_as_string(stamps.astype("datetime64[us]"), unit="us")
+        text = np.where(whole, text, fraction)
+    return np.char.add(text, "+00:00").tolist()